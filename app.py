@@ -1,6 +1,7 @@
 from flask import Flask, render_template, request, send_file, jsonify
 from flask_sqlalchemy import SQLAlchemy
 import os
+import click
 
 app = Flask(__name__)
 
@@ -47,6 +48,19 @@ def get_note(note_id):
         return jsonify({"id": note.id, "text": note.text})
     return jsonify({"error": "Not found"}), 404
 
+# ---------------------
+# CLI Commands
+# ---------------------
+# Create tables explicitly instead of at import time,
+# so Gunicorn workers don't pay for it on startup.
+# Run once per deploy: flask --app app init-db
+# ---------------------
+
+@app.cli.command('init-db')
+def init_db():
+    db.create_all()
+    click.echo("Database tables created.")
+
 # ---------------------
 # Local Development Only
 # ---------------------
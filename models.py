@@ -4,6 +4,9 @@ Using SQLAlchemy ORM for PostgreSQL
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert as pg_insert
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime
 
 db = SQLAlchemy()
@@ -25,6 +28,10 @@ class User(db.Model):
 class JournalEntry(db.Model):
     """Journal entries with sentiment analysis"""
     __tablename__ = 'journal_entries'
+    __table_args__ = (
+        # Serves the newest-first listing/analysis order (scanned backwards)
+        db.Index('ix_journal_date_time', 'date', 'time'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
@@ -53,6 +60,132 @@ class JournalEntry(db.Model):
             'score': self.score,
             'edited': self.edited_at.strftime('%Y-%m-%d %H:%M') if self.edited_at else None
         }
+    
+    def update_content(self, title, content, analyze):
+        """
+        Apply an edit, re-running sentiment analysis only if the text changed
+        analyze: the text -> analysis dict function (e.g. analyze_sentiment),
+        passed in so the model layer does not load the NLP module
+        Returns True when the sentiment fields were recalculated
+        """
+        self.title = title
+        
+        if content == self.content:
+            return False
+        
+        self.content = content
+        
+        analysis = analyze(content)
+        self.sentiment = analysis['sentiment']
+        self.score = analysis['score']
+        self.polarity = analysis['polarity']
+        self.subjectivity = analysis['subjectivity']
+        return True
+    
+    @classmethod
+    def fetch_entry_dicts(cls):
+        """
+        Every entry as a to_dict()-shaped dict, newest first
+        Reads plain rows in batches instead of tracked ORM instances
+        for the read-only listing and download views
+        """
+        result = db.session.execute(
+            db.select(cls.id, cls.title, cls.content, cls.date, cls.time,
+                      cls.sentiment, cls.score, cls.edited_at)
+            .order_by(cls.date.desc(), cls.time.desc())
+            .execution_options(yield_per=200)
+        )
+        
+        return [{
+            'id': str(row.id),
+            'title': row.title,
+            'content': row.content,
+            'date': row.date.strftime('%Y-%m-%d'),
+            'time': row.time.strftime('%H:%M'),
+            'sentiment': row.sentiment,
+            'score': row.score,
+            'edited': row.edited_at.strftime('%Y-%m-%d %H:%M') if row.edited_at else None
+        } for row in result]
+    
+    @classmethod
+    def data_version(cls):
+        """
+        Cheap cache key for anything derived from the entries
+        Changes whenever an entry is added, removed or edited; use it as the
+        ETag and compare with If-None-Match to answer 304 without re-rendering
+        (a write time alone misses deletions)
+        """
+        return tuple(db.session.execute(
+            db.select(db.func.count(cls.id), db.func.max(cls.id),
+                      db.func.max(db.func.coalesce(cls.edited_at, cls.created_at)))
+        ).one())
+    
+    @classmethod
+    def fetch_analysis_rows(cls):
+        """
+        Fetch only the columns the mood analysis needs, newest first
+        Returns (entries, all_text) built in a single pass over the rows
+        Entries carry 'date_obj' so the analyzer never re-parses 'date'
+        """
+        rows = db.session.execute(
+            db.select(cls.date, cls.time, cls.sentiment, cls.score, cls.content)
+            .order_by(cls.date.desc(), cls.time.desc())
+        ).all()
+        
+        entries = []
+        contents = []
+        for row in rows:
+            entries.append({
+                'date': row.date.strftime('%Y-%m-%d'),
+                'date_obj': row.date,
+                'time': row.time.strftime('%H:%M'),
+                'sentiment': row.sentiment,
+                'score': row.score,
+                'content': row.content
+            })
+            contents.append(row.content)
+        
+        return entries, ' '.join(contents)
+    
+    @classmethod
+    def sentiment_distribution(cls):
+        """Count entries per sentiment with one GROUP BY"""
+        rows = db.session.execute(
+            db.select(cls.sentiment, db.func.count(cls.id)).group_by(cls.sentiment)
+        ).all()
+        return {sentiment: count for sentiment, count in rows if sentiment}
+    
+    @classmethod
+    def daily_scores(cls):
+        """Average sentiment score per day, oldest first"""
+        rows = db.session.execute(
+            db.select(cls.date, db.func.avg(cls.score)).group_by(cls.date).order_by(cls.date)
+        ).all()
+        return {entry_date.strftime('%Y-%m-%d'): float(score or 0) for entry_date, score in rows}
+    
+    @classmethod
+    def current_streak(cls):
+        """
+        Consecutive journaling days ending at the most recent entry
+        Walks distinct dates newest first and stops reading at the first gap
+        """
+        result = db.session.scalars(
+            db.select(cls.date).distinct().order_by(cls.date.desc())
+            .execution_options(yield_per=100)
+        )
+        
+        streak = 0
+        previous = None
+        try:
+            for entry_date in result:
+                if previous is not None and (previous - entry_date).days != 1:
+                    break
+                streak += 1
+                previous = entry_date
+        finally:
+            result.close()
+        
+        return streak
 
 class DailyLog(db.Model):
     """Daily tracking logs for dashboard"""
@@ -60,7 +193,7 @@ class DailyLog(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
-    date = db.Column(db.Date, nullable=False, unique=True)
+    date = db.Column(db.Date, nullable=False, unique=True)  # unique index also serves ORDER BY date
     
     # Tracking metrics
     sleep_hours = db.Column(db.Float, nullable=False, default=0)
@@ -83,6 +216,113 @@ class DailyLog(db.Model):
             'exercise_minutes': int(self.exercise_minutes),
             'productivity_score': int(self.productivity_score)
         }
+    
+    @classmethod
+    def upsert(cls, log_date, **metrics):
+        """
+        Save the log for a date in one atomic INSERT ... ON CONFLICT (date) DO UPDATE
+        Replaces the SELECT-then-INSERT/UPDATE round trip
+        """
+        dialect = db.session.get_bind().dialect.name
+        insert = sqlite_insert if dialect == 'sqlite' else pg_insert
+        
+        stmt = insert(cls).values(date=log_date, **metrics)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['date'],
+            set_={**metrics, 'updated_at': datetime.utcnow()}
+        )
+        
+        db.session.execute(stmt)
+        db.session.commit()
+    
+    @classmethod
+    def fetch_metric_tuples(cls, limit=None):
+        """
+        Fetch (date, *metrics) rows oldest first, optionally only the latest N
+        Metrics come in to_dict() order; insights_generator.metric_rows_to_arrays
+        turns them into chart/kernel arrays
+        """
+        query = db.select(cls.date, cls.sleep_hours, cls.mood_rating, cls.study_hours,
+                          cls.water_intake, cls.exercise_minutes, cls.productivity_score)
+        
+        if limit is None:
+            return db.session.execute(query.order_by(cls.date)).all()
+        
+        rows = db.session.execute(query.order_by(cls.date.desc()).limit(limit)).all()
+        rows.reverse()
+        return rows
+    
+    @classmethod
+    def fetch_metric_rows(cls, limit=None):
+        """
+        Fetch the tracked metrics, oldest first
+        Same shape as to_dict() without building full ORM instances
+        limit: only fetch the most recent N logs (e.g. the 30 charted days)
+        """
+        rows = cls.fetch_metric_tuples(limit)
+        
+        return [{
+            'date': row.date.strftime('%Y-%m-%d'),
+            'sleep_hours': float(row.sleep_hours),
+            'mood_rating': float(row.mood_rating),
+            'study_hours': float(row.study_hours),
+            'water_intake': int(row.water_intake),
+            'exercise_minutes': int(row.exercise_minutes),
+            'productivity_score': int(row.productivity_score)
+        } for row in rows]
+    
+    @classmethod
+    def fetch_averages(cls):
+        """
+        Average every metric over the full history in SQL
+        Matches insights_generator.calculate_averages without loading the rows
+        """
+        row = db.session.execute(
+            db.select(
+                db.func.count(cls.id).label('count'),
+                db.func.avg(cls.sleep_hours).label('sleep_hours'),
+                db.func.avg(cls.mood_rating).label('mood_rating'),
+                db.func.avg(cls.study_hours).label('study_hours'),
+                db.func.avg(cls.water_intake).label('water_intake'),
+                db.func.avg(cls.exercise_minutes).label('exercise_minutes'),
+                db.func.avg(cls.productivity_score).label('productivity_score')
+            )
+        ).one()
+        
+        if not row.count:
+            return None
+        
+        averages = row._asdict()
+        del averages['count']
+        return {metric: float(value) for metric, value in averages.items()}
+    
+    @classmethod
+    def data_version(cls):
+        """
+        Cheap cache key for anything derived from the logs
+        Changes whenever a log is added, removed or updated
+        """
+        return tuple(db.session.execute(
+            db.select(db.func.count(cls.id), db.func.max(cls.id),
+                      db.func.max(db.func.coalesce(cls.updated_at, cls.created_at)))
+        ).one())
+    
+    @classmethod
+    def iter_csv_lines(cls):
+        """
+        Yield the CSV export line by line, streaming rows from the database
+        Wrap in Response(stream_with_context(...), mimetype='text/csv')
+        """
+        yield 'date,sleep_hours,mood_rating,study_hours,water_intake,exercise_minutes,productivity_score\n'
+        
+        rows = db.session.execute(
+            db.select(cls.date, cls.sleep_hours, cls.mood_rating, cls.study_hours,
+                      cls.water_intake, cls.exercise_minutes, cls.productivity_score)
+            .order_by(cls.date)
+            .execution_options(yield_per=1000)
+        )
+        for row in rows:
+            yield ','.join(map(str, row)) + '\n'
 
 class MealPlan(db.Model):
     """Saved meal plans"""
@@ -105,8 +345,8 @@ class MealPlan(db.Model):
     bmr = db.Column(db.Float)
     calorie_goal = db.Column(db.Integer)
     
-    # Meal plan data (stored as JSON)
-    meal_plan_data = db.Column(db.JSON)
+    # Meal plan data (stored as JSON, JSONB on PostgreSQL)
+    meal_plan_data = db.Column(db.JSON().with_variant(JSONB, 'postgresql'))
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -125,4 +365,31 @@ class MealPlan(db.Model):
             'calorie_goal': self.calorie_goal,
             'meal_plan_data': self.meal_plan_data,
             'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S')
-        }
\ No newline at end of file
+        }
+    
+    @classmethod
+    def patch_meal(cls, plan_id, day_index, meal_type, meal, daily_total):
+        """
+        Replace one meal (and that day's daily_total) in a stored plan
+        On PostgreSQL this is a single server-side jsonb_set UPDATE, so the
+        rest of the plan never leaves the database
+        """
+        if db.session.get_bind().dialect.name == 'postgresql':
+            day = str(day_index)
+            patched = db.func.jsonb_set(
+                db.func.jsonb_set(cls.meal_plan_data,
+                                  db.cast([day, meal_type], ARRAY(db.Text)),
+                                  db.cast(meal, JSONB)),
+                db.cast([day, 'daily_total'], ARRAY(db.Text)),
+                db.cast(daily_total, JSONB)
+            )
+            db.session.execute(
+                db.update(cls).where(cls.id == plan_id).values(meal_plan_data=patched)
+            )
+        else:
+            plan = db.session.get(cls, plan_id)
+            plan.meal_plan_data[day_index][meal_type] = meal
+            plan.meal_plan_data[day_index]['daily_total'] = daily_total
+            flag_modified(plan, 'meal_plan_data')
+        
+        db.session.commit()
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Numeric kernels for the insights generator
+Compiled with Numba (pinned in requirements.txt); the plain NumPy versions
+only serve environments where it is not installed
+All kernels take metric arrays laid out one row per metric (SoA)
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # e.g. a dev install without the pinned requirements
+    njit = None
+
+
+if njit is not None:
+    # Explicit 'A'-layout signatures compile eagerly and accept any array
+    # layout, so slices and fancy-indexed views never trigger a recompile
+    @njit('float64[:](float64[:, :])', cache=True)
+    def column_means(data):
+        """Mean of each metric row"""
+        rows, count = data.shape
+        means = np.empty(rows)
+        for i in range(rows):
+            total = 0.0
+            for j in range(count):
+                total += data[i, j]
+            means[i] = total / count
+        return means
+
+    @njit('Tuple((float64, float64, int64, int64))(float64[:], boolean[:])', cache=True)
+    def split_means(values, mask):
+        """
+        Mean of values where mask is set and where it is not
+        Returns (inside_mean, outside_mean, inside_count, outside_count)
+        """
+        inside_total = 0.0
+        outside_total = 0.0
+        inside_count = 0
+        outside_count = 0
+        for i in range(values.shape[0]):
+            if mask[i]:
+                inside_total += values[i]
+                inside_count += 1
+            else:
+                outside_total += values[i]
+                outside_count += 1
+        inside_mean = inside_total / inside_count if inside_count else np.nan
+        outside_mean = outside_total / outside_count if outside_count else np.nan
+        return inside_mean, outside_mean, inside_count, outside_count
+
+    @njit('Tuple((float64[:], float64[:]))(float64[:, :])', cache=True)
+    def column_stats(data):
+        """
+        Mean and sample standard deviation of each metric row
+        Standard deviations are NaN with fewer than two values
+        """
+        rows, count = data.shape
+        means = np.empty(rows)
+        stds = np.full(rows, np.nan)
+        for i in range(rows):
+            total = 0.0
+            for j in range(count):
+                total += data[i, j]
+            mean = total / count
+            means[i] = mean
+            if count > 1:
+                squares = 0.0
+                for j in range(count):
+                    diff = data[i, j] - mean
+                    squares += diff * diff
+                stds[i] = np.sqrt(squares / (count - 1))
+        return means, stds
+else:
+    def column_means(data):
+        """Mean of each metric row"""
+        return data.mean(axis=1)
+
+    def split_means(values, mask):
+        """
+        Mean of values where mask is set and where it is not
+        Returns (inside_mean, outside_mean, inside_count, outside_count)
+        """
+        inside = values[mask]
+        outside = values[~mask]
+        return (inside.mean() if inside.size else np.nan,
+                outside.mean() if outside.size else np.nan,
+                inside.size, outside.size)
+
+    def column_stats(data):
+        """
+        Mean and sample standard deviation of each metric row
+        Standard deviations are NaN with fewer than two values
+        """
+        if data.shape[1] > 1:
+            stds = data.std(axis=1, ddof=1)
+        else:
+            stds = np.full(data.shape[0], np.nan)
+        return data.mean(axis=1), stds
+
+
+def window_means(data, days):
+    """
+    Per-metric means of the last `days` columns and of the window before it
+    (the first `days` columns when there is not enough history for two windows)
+    data must be sorted by date, oldest first
+    """
+    count = data.shape[1]
+    recent = data[:, count - days:]
+    if count >= days * 2:
+        previous = data[:, count - days * 2:count - days]
+    else:
+        previous = data[:, :days]
+    return column_means(recent), column_means(previous)
+
@@ -3,6 +3,18 @@ Fitness Calculator Module
 Handles BMI calculations and calorie requirements
 """
 
+from functools import lru_cache
+
+import numpy as np
+
+ACTIVITY_MULTIPLIERS = {
+    'sedentary': 1.2,
+    'light': 1.375,
+    'moderate': 1.55,
+    'active': 1.725,
+    'very_active': 1.9
+}
+
 def calculate_bmi(weight_kg, height_cm):
     """Calculate Body Mass Index"""
     height_m = height_cm / 100
@@ -42,15 +54,7 @@ def calculate_tdee(bmr, activity_level):
     - active: exercise 6-7 days/week
     - very_active: intense exercise daily
     """
-    activity_multipliers = {
-        'sedentary': 1.2,
-        'light': 1.375,
-        'moderate': 1.55,
-        'active': 1.725,
-        'very_active': 1.9
-    }
-    
-    multiplier = activity_multipliers.get(activity_level.lower(), 1.2)
+    multiplier = ACTIVITY_MULTIPLIERS.get(activity_level.lower(), 1.2)
     tdee = bmr * multiplier
     
     return round(tdee, 2)
@@ -104,7 +108,15 @@ def calculate_macros(calories, goal):
 def get_complete_profile(age, weight_kg, height_cm, gender, activity_level, goal):
     """
     Generate complete fitness profile with all calculations
+    Results are cached per input; each call gets its own copy to mutate
     """
+    profile = _cached_profile(age, weight_kg, height_cm, gender.lower(),
+                              activity_level.lower(), goal.lower())
+    return {**profile, 'macros': dict(profile['macros'])}
+
+@lru_cache(maxsize=4096)
+def _cached_profile(age, weight_kg, height_cm, gender, activity_level, goal):
+    """Compute the profile once per normalized input (never mutate the result)"""
     bmi = calculate_bmi(weight_kg, height_cm)
     bmi_category = get_bmi_category(bmi)
     bmr = calculate_bmr(age, weight_kg, height_cm, gender)
@@ -119,4 +131,67 @@ def get_complete_profile(age, weight_kg, height_cm, gender, activity_level, goal
         'tdee': tdee,
         'calorie_goal': calorie_goal,
         'macros': macros
-    }
\ No newline at end of file
+    }
+
+def _round_like_scalar(values, digits):
+    """
+    np.round, matching Python's round() at ties
+    np.round scales by 10**digits before rounding, which can land on the other
+    side of a tie from round(); only those few elements go through round()
+    """
+    rounded = np.round(values, digits)
+    scaled = values * 10.0 ** digits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    rounded[near_tie] = [round(value, digits) for value in values[near_tie].tolist()]
+    return rounded
+
+def get_complete_profile_batch(ages, weights_kg, heights_cm, genders, activity_levels, goals):
+    """
+    Vectorized get_complete_profile for many profiles at once
+    (e.g. recomputing stored meal plans or reports across users)
+    Returns the same keys as get_complete_profile, each a NumPy array
+    Every value matches get_complete_profile for the same inputs
+    """
+    age = np.asarray(ages, dtype=np.float64)
+    weight = np.asarray(weights_kg, dtype=np.float64)
+    height = np.asarray(heights_cm, dtype=np.float64)
+    is_male = np.char.lower(np.asarray(genders, dtype=str)) == 'male'
+    levels = np.char.lower(np.asarray(activity_levels, dtype=str))
+    goal = np.char.lower(np.asarray(goals, dtype=str))
+    
+    bmi = _round_like_scalar(weight / (height / 100) ** 2, 2)
+    bmi_category = np.select(
+        [bmi < 18.5, bmi < 25, bmi < 30],
+        ['Underweight', 'Normal weight', 'Overweight'],
+        'Obese'
+    )
+    
+    # Mifflin-St Jeor, same as calculate_bmr
+    bmr = _round_like_scalar((10 * weight) + (6.25 * height) - (5 * age) + np.where(is_male, 5, -161), 2)
+    
+    multiplier = np.full(bmr.shape, 1.2)
+    for level, value in ACTIVITY_MULTIPLIERS.items():
+        multiplier[levels == level] = value
+    tdee = _round_like_scalar(bmr * multiplier, 2)
+    
+    lose = goal == 'lose'
+    gain = goal == 'gain'
+    calorie_goal = _round_like_scalar(tdee + np.select([lose, gain], [-500, 500], 0), 2)
+    
+    # Ratios match calculate_macros
+    protein_ratio = np.select([lose, gain], [0.35, 0.30], 0.30)
+    carbs_ratio = np.select([lose, gain], [0.35, 0.45], 0.40)
+    fat_ratio = np.select([lose, gain], [0.30, 0.25], 0.30)
+    
+    return {
+        'bmi': bmi,
+        'bmi_category': bmi_category,
+        'bmr': bmr,
+        'tdee': tdee,
+        'calorie_goal': calorie_goal,
+        'macros': {
+            'protein': _round_like_scalar((calorie_goal * protein_ratio) / 4, 1),
+            'carbs': _round_like_scalar((calorie_goal * carbs_ratio) / 4, 1),
+            'fats': _round_like_scalar((calorie_goal * fat_ratio) / 9, 1)
+        }
+    }
@@ -3,47 +3,124 @@ Insights Generator Module
 Generates insights from self-tracking dashboard data
 """
 
-from datetime import datetime, timedelta
-from statistics import mean, stdev
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
 from collections import defaultdict
 
-def calculate_averages(logs):
-    """Calculate average values for all metrics"""
+import numpy as np
+
+from ._insights_kernels import column_means, column_stats, split_means, window_means
+
+_METRICS = ('sleep_hours', 'mood_rating', 'study_hours', 'water_intake',
+            'exercise_minutes', 'productivity_score')
+_CONSISTENCY_METRICS = ('sleep_hours', 'exercise_minutes', 'study_hours')
+
+def _logs_to_arrays(logs):
+    """Convert logs to a float64 array with one row per metric in _METRICS order"""
+    count = len(logs)
+    return np.array([np.fromiter((log[metric] for log in logs), dtype=np.float64, count=count)
+                     for metric in _METRICS])
+
+def _int_metrics(logs, metrics=_METRICS):
+    """
+    The metrics whose values are ints in every log
+    statistics.mean kept a whole average of ints an int (8, not 8.0), and the
+    dashboard and report text show the value as is
+    """
+    return frozenset(metric for metric in metrics
+                     if all(isinstance(log[metric], int) for log in logs))
+
+def _mean_value(mean, is_int):
+    """A mean typed as statistics.mean returned it: whole means of ints stay ints"""
+    mean = float(mean)
+    return int(mean) if is_int and mean.is_integer() else mean
+
+def metric_rows_to_arrays(rows):
+    """
+    Convert (date, *metrics) rows with metrics in _METRICS order
+    (DailyLog.fetch_metric_tuples) to (dates, data) like _logs_to_arrays
+    """
+    dates = [row[0].strftime('%Y-%m-%d') for row in rows]
+    data = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(_METRICS)).T
+    return dates, np.ascontiguousarray(data)
+
+def build_chart_data(dates, data, days=30):
+    """
+    Build the dashboard chart series from column arrays (see _logs_to_arrays)
+    Only the last `days` logs are charted
+    """
+    recent = data[:, -days:]
+    
+    return {
+        'dates': dates[-days:],
+        'sleep': recent[0].tolist(),
+        'mood': recent[1].tolist(),
+        'study': recent[2].tolist(),
+        'water': recent[3].astype(np.int64).tolist(),
+        'exercise': recent[4].astype(np.int64).tolist(),
+        'productivity': recent[5].astype(np.int64).tolist()
+    }
+
+def calculate_averages(logs, data=None):
+    """
+    Calculate average values for all metrics
+    Values are left unrounded; the dashboard rounds them for display
+    data: the logs already converted with _logs_to_arrays, to skip converting again
+    """
     if not logs:
         return None
     
-    metrics = ['sleep_hours', 'mood_rating', 'study_hours', 'water_intake', 
-               'exercise_minutes', 'productivity_score']
+    if data is None:
+        try:
+            data = _logs_to_arrays(logs)
+        except KeyError:
+            return _partial_averages(logs)
+    means = column_means(data)
+    int_metrics = _int_metrics(logs)
     
+    return {metric: _mean_value(means[i], metric in int_metrics) for i, metric in enumerate(_METRICS)}
+
+def _partial_averages(logs):
+    """
+    calculate_averages for logs missing some metrics
+    Each metric averages over the logs that have it (0 when none do)
+    """
     averages = {}
-    for metric in metrics:
+    for metric in _METRICS:
         values = [log[metric] for log in logs if metric in log]
         if values:
-            averages[metric] = round(mean(values), 2)
+            averages[metric] = _mean_value(np.mean(values), all(isinstance(value, int) for value in values))
         else:
             averages[metric] = 0
     
     return averages
 
-def calculate_trends(logs, days=7):
+def calculate_trends(logs, days=7, data=None, presorted=False):
     """
     Calculate trends (improving, declining, stable) for each metric
+    data: the logs already converted with _logs_to_arrays, to skip converting again
+    presorted: logs (and data) are already in date order, oldest first
     """
     if len(logs) < days:
         return None
     
-    # Sort logs by date
-    sorted_logs = sorted(logs, key=lambda x: x['date'])
-    recent_logs = sorted_logs[-days:]
-    previous_logs = sorted_logs[-days*2:-days] if len(sorted_logs) >= days*2 else sorted_logs[:days]
-    
-    metrics = ['sleep_hours', 'mood_rating', 'study_hours', 'water_intake', 
-               'exercise_minutes', 'productivity_score']
+    # Sort by date; both windows fall inside the last days*2 logs
+    if data is None:
+        sorted_logs = logs if presorted else sorted(logs, key=lambda x: x['date'])
+        window = _logs_to_arrays(sorted_logs[-days*2:])
+    elif presorted:
+        window = data[:, -days*2:]
+    else:
+        order = np.argsort([log['date'] for log in logs], kind='stable')
+        window = data[:, order[-days*2:]]
+    recent_means, previous_means = window_means(window, days)
+    int_metrics = _int_metrics(logs)
     
     trends = {}
-    for metric in metrics:
-        recent_avg = mean([log[metric] for log in recent_logs])
-        previous_avg = mean([log[metric] for log in previous_logs])
+    for i, metric in enumerate(_METRICS):
+        is_int = metric in int_metrics
+        recent_avg = _mean_value(recent_means[i], is_int)
+        previous_avg = _mean_value(previous_means[i], is_int)
         
         change_percent = ((recent_avg - previous_avg) / previous_avg * 100) if previous_avg > 0 else 0
         
@@ -63,22 +140,26 @@ def calculate_trends(logs, days=7):
     
     return trends
 
-def find_correlations(logs):
+def find_correlations(logs, data=None):
     """
     Find correlations between different metrics
+    data: the logs already converted with _logs_to_arrays, to skip converting again
     """
     if len(logs) < 7:
         return []
     
     insights = []
+    if data is None:
+        data = _logs_to_arrays(logs)
+    sleep, mood, study, water, exercise, productivity = data
+    int_metrics = _int_metrics(logs, ('mood_rating', 'productivity_score'))
     
     # Group logs by sleep quality
-    high_sleep = [log for log in logs if log['sleep_hours'] >= 7]
-    low_sleep = [log for log in logs if log['sleep_hours'] < 7]
+    high_sleep_mood, low_sleep_mood, high_sleep, low_sleep = split_means(mood, sleep >= 7)
     
     if high_sleep and low_sleep:
-        high_sleep_mood = mean([log['mood_rating'] for log in high_sleep])
-        low_sleep_mood = mean([log['mood_rating'] for log in low_sleep])
+        high_sleep_mood = _mean_value(high_sleep_mood, 'mood_rating' in int_metrics)
+        low_sleep_mood = _mean_value(low_sleep_mood, 'mood_rating' in int_metrics)
         
         if high_sleep_mood > low_sleep_mood + 0.5:
             insights.append({
@@ -88,12 +169,11 @@ def find_correlations(logs):
             })
     
     # Exercise and productivity correlation
-    high_exercise = [log for log in logs if log['exercise_minutes'] >= 30]
-    low_exercise = [log for log in logs if log['exercise_minutes'] < 30]
+    high_ex_prod, low_ex_prod, high_exercise, low_exercise = split_means(productivity, exercise >= 30)
     
     if high_exercise and low_exercise:
-        high_ex_prod = mean([log['productivity_score'] for log in high_exercise])
-        low_ex_prod = mean([log['productivity_score'] for log in low_exercise])
+        high_ex_prod = _mean_value(high_ex_prod, 'productivity_score' in int_metrics)
+        low_ex_prod = _mean_value(low_ex_prod, 'productivity_score' in int_metrics)
         
         if high_ex_prod > low_ex_prod + 5:
             insights.append({
@@ -103,10 +183,9 @@ def find_correlations(logs):
             })
     
     # Study hours and mood
-    high_study = [log for log in logs if log['study_hours'] >= 4]
+    avg_mood, _, high_study, _ = split_means(mood, study >= 4)
     if high_study:
-        avg_mood = mean([log['mood_rating'] for log in high_study])
-        overall_mood = mean([log['mood_rating'] for log in logs])
+        overall_mood = mood.mean()
         
         if avg_mood < overall_mood - 0.5:
             insights.append({
@@ -116,10 +195,9 @@ def find_correlations(logs):
             })
     
     # Water intake and productivity
-    good_hydration = [log for log in logs if log['water_intake'] >= 8]
-    if good_hydration and len(good_hydration) < len(logs):
-        good_hydration_prod = mean([log['productivity_score'] for log in good_hydration])
-        overall_prod = mean([log['productivity_score'] for log in logs])
+    good_hydration_prod, _, good_hydration, poor_hydration = split_means(productivity, water >= 8)
+    if good_hydration and poor_hydration:
+        overall_prod = productivity.mean()
         
         if good_hydration_prod > overall_prod + 5:
             insights.append({
@@ -137,19 +215,31 @@ def generate_weekly_report(logs):
     if not logs:
         return None
     
-    # Get last 7 days
-    today = datetime.now()
-    week_ago = today - timedelta(days=7)
+    # Sort once; the trends and the last-7-days window both read the sorted logs
+    logs = sorted(logs, key=lambda x: x['date'])
     
-    recent_logs = [log for log in logs 
-                   if datetime.strptime(log['date'], '%Y-%m-%d') >= week_ago]
+    # Get last 7 days; one clock read serves the cutoff and the period label
+    now = datetime.now()
+    week_ago = now - timedelta(days=7)
+    period = f"{week_ago.strftime('%B %d')} - {now.strftime('%B %d, %Y')}"
+    
+    # ISO dates sort as strings; a log's midnight is only on/after week_ago
+    # (which carries the current time) when its date is strictly later
+    week_ago_str = week_ago.strftime('%Y-%m-%d')
+    start = bisect_right([log['date'] for log in logs], week_ago_str)
+    recent_logs = logs[start:]
     
     if not recent_logs:
         return None
     
-    averages = calculate_averages(recent_logs)
-    trends = calculate_trends(logs, days=7)
-    insights = find_correlations(logs)
+    # Convert once and share the arrays with every calculation below
+    data = _logs_to_arrays(logs)
+    recent_means, recent_stds = column_stats(data[:, start:])
+    int_metrics = _int_metrics(recent_logs)
+    averages = {metric: round(_mean_value(recent_means[i], metric in int_metrics), 2)
+                for i, metric in enumerate(_METRICS)}
+    trends = calculate_trends(logs, days=7, data=data, presorted=True)
+    insights = find_correlations(logs, data)
     
     # Find best and worst days
     best_day = max(recent_logs, key=lambda x: x['mood_rating'])
@@ -157,28 +247,25 @@ def generate_weekly_report(logs):
     
     # Most consistent metric
     consistency_scores = {}
-    metrics = ['sleep_hours', 'exercise_minutes', 'study_hours']
     
-    for metric in metrics:
-        values = [log[metric] for log in recent_logs]
-        if len(values) > 1:
-            std = stdev(values)
-            consistency_scores[metric] = std
+    if len(recent_logs) > 1:
+        for metric in _CONSISTENCY_METRICS:
+            consistency_scores[metric] = float(recent_stds[_METRICS.index(metric)])
     
     most_consistent = min(consistency_scores.items(), key=lambda x: x[1])[0] if consistency_scores else None
     
     report = {
-        'period': f"{week_ago.strftime('%B %d')} - {today.strftime('%B %d, %Y')}",
+        'period': period,
         'days_logged': len(recent_logs),
         'averages': averages,
         'trends': trends,
         'insights': insights,
         'best_day': {
-            'date': datetime.strptime(best_day['date'], '%Y-%m-%d').strftime('%A, %B %d'),
+            'date': date.fromisoformat(best_day['date']).strftime('%A, %B %d'),
             'mood': best_day['mood_rating']
         },
         'worst_day': {
-            'date': datetime.strptime(worst_day['date'], '%Y-%m-%d').strftime('%A, %B %d'),
+            'date': date.fromisoformat(worst_day['date']).strftime('%A, %B %d'),
             'mood': worst_day['mood_rating']
         },
         'most_consistent': most_consistent
@@ -210,8 +297,19 @@ def calculate_progress_badges(logs):
             'icon': '⭐'
         })
     
+    # Count every badge condition in one pass over the logs
+    good_sleep_days = exercise_days = hydrated_days = productive_days = 0
+    for log in logs:
+        if log['sleep_hours'] >= 7:
+            good_sleep_days += 1
+        if log['exercise_minutes'] >= 30:
+            exercise_days += 1
+        if log['water_intake'] >= 8:
+            hydrated_days += 1
+        if log['productivity_score'] >= 80:
+            productive_days += 1
+    
     # Sleep champion
-    good_sleep_days = len([log for log in logs if log['sleep_hours'] >= 7])
     if good_sleep_days >= 5:
         badges.append({
             'name': 'Sleep Champion',
@@ -220,7 +318,6 @@ def calculate_progress_badges(logs):
         })
     
     # Exercise enthusiast
-    exercise_days = len([log for log in logs if log['exercise_minutes'] >= 30])
     if exercise_days >= 5:
         badges.append({
             'name': 'Fitness Enthusiast',
@@ -229,7 +326,6 @@ def calculate_progress_badges(logs):
         })
     
     # Hydration hero
-    hydrated_days = len([log for log in logs if log['water_intake'] >= 8])
     if hydrated_days >= 5:
         badges.append({
             'name': 'Hydration Hero',
@@ -238,7 +334,6 @@ def calculate_progress_badges(logs):
         })
     
     # High productivity
-    productive_days = len([log for log in logs if log['productivity_score'] >= 80])
     if productive_days >= 3:
         badges.append({
             'name': 'Productivity Pro',
@@ -4,6 +4,11 @@ Generates 7-day meal plans based on dietary restrictions and calorie goals
 """
 
 import random
+from collections import namedtuple
+from functools import lru_cache, reduce
+from operator import or_
+
+MEAL_SLOTS = ('breakfast', 'lunch', 'dinner', 'snack')
 
 # Meal database with different dietary options
 MEALS = {
@@ -233,32 +238,72 @@ MEALS = {
     ]
 }
 
+# One bit per dietary restriction; each meal gets a precomputed tag mask
+# so matching all restrictions is a single AND + compare
+_BITS = {'vegetarian': 1, 'vegan': 2, 'halal': 4, 'lactose_free': 8}
+
+# Meals are looked up by attribute from here on; the tags collapse into the mask
+Meal = namedtuple('Meal', 'name calories protein carbs fats mask')
+
+MEALS = {
+    category: [
+        Meal(meal['name'], meal['calories'], meal['protein'], meal['carbs'], meal['fats'],
+             reduce(or_, (_BITS[tag] for tag in meal['tags']), 0))
+        for meal in meals
+    ]
+    for category, meals in MEALS.items()
+}
+
 def filter_meals_by_restrictions(meals, restrictions):
     """Filter meals based on dietary restrictions"""
     if not restrictions:
         return meals
     
-    filtered = []
-    for meal in meals:
-        # Check if meal matches all restrictions
-        if all(restriction in meal['tags'] for restriction in restrictions):
-            filtered.append(meal)
+    # No meal carries an unknown restriction
+    if not all(restriction in _BITS for restriction in restrictions):
+        return meals
     
-    return filtered if filtered else meals  # Return all if no matches
+    required = reduce(or_, (_BITS[restriction] for restriction in restrictions), 0)
+    # Return all if no matches; stops at the first meal that fits
+    if not any(meal.mask & required == required for meal in meals):
+        return meals
+    
+    # Check if meal matches all restrictions
+    return [meal for meal in meals if meal.mask & required == required]
+
+@lru_cache(maxsize=64)
+def _filtered_options(category, restrictions):
+    """
+    Cached filter_meals_by_restrictions for one MEALS category
+    restrictions: frozenset, so any ordering of the same diet shares an entry
+    """
+    return tuple(filter_meals_by_restrictions(MEALS[category], restrictions))
 
-def scale_meal(meal, target_calories, meal_type_calories):
-    """Scale meal proportionally to meet calorie target"""
-    if meal['calories'] == 0:
-        return meal
+def scale_meal(meal, meal_type_calories):
+    """
+    Scale a Meal proportionally to meet calorie target
+    Returns a plain dict, the form stored in the plan and rendered in the PDF
+    """
+    calories = meal.calories
+    scale_factor = meal_type_calories / calories if calories else 1.0
     
-    scale_factor = meal_type_calories / meal['calories']
+    # Within 5% of the target the meal is served as authored (macros stay
+    # floats like scaled ones, so a plan never mixes '18g' with '17.3g')
+    if 0.95 <= scale_factor <= 1.05:
+        return {
+            'name': meal.name,
+            'calories': calories,
+            'protein': float(meal.protein),
+            'carbs': float(meal.carbs),
+            'fats': float(meal.fats)
+        }
     
     return {
-        'name': meal['name'],
-        'calories': round(meal['calories'] * scale_factor),
-        'protein': round(meal['protein'] * scale_factor, 1),
-        'carbs': round(meal['carbs'] * scale_factor, 1),
-        'fats': round(meal['fats'] * scale_factor, 1)
+        'name': meal.name,
+        'calories': round(calories * scale_factor),
+        'protein': round(meal.protein * scale_factor, 1),
+        'carbs': round(meal.carbs * scale_factor, 1),
+        'fats': round(meal.fats * scale_factor, 1)
     }
 
 def generate_meal_plan(calorie_goal, restrictions, days=7):
@@ -274,55 +319,73 @@ def generate_meal_plan(calorie_goal, restrictions, days=7):
     
     meal_plan = []
     
-    for day in range(1, days + 1):
-        # Filter meals by restrictions
-        breakfast_options = filter_meals_by_restrictions(MEALS['breakfast'], restrictions)
-        lunch_options = filter_meals_by_restrictions(MEALS['lunch'], restrictions)
-        dinner_options = filter_meals_by_restrictions(MEALS['dinner'], restrictions)
-        snack_options = filter_meals_by_restrictions(MEALS['snacks'], restrictions)
-        
-        # Select random meals
-        breakfast = random.choice(breakfast_options)
-        lunch = random.choice(lunch_options)
-        dinner = random.choice(dinner_options)
-        snack = random.choice(snack_options)
-        
+    # Filter meals by restrictions (the same for every day)
+    restrictions = frozenset(restrictions or ())
+    breakfast_options = _filtered_options('breakfast', restrictions)
+    lunch_options = _filtered_options('lunch', restrictions)
+    dinner_options = _filtered_options('dinner', restrictions)
+    snack_options = _filtered_options('snacks', restrictions)
+    
+    # Select random meals for every day at once
+    picks = zip(random.choices(breakfast_options, k=days),
+                random.choices(lunch_options, k=days),
+                random.choices(dinner_options, k=days),
+                random.choices(snack_options, k=days))
+    
+    for day, (breakfast, lunch, dinner, snack) in enumerate(picks, 1):
         # Scale meals to target calories
-        breakfast = scale_meal(breakfast, calorie_goal, breakfast_cals)
-        lunch = scale_meal(lunch, calorie_goal, lunch_cals)
-        dinner = scale_meal(dinner, calorie_goal, dinner_cals)
-        snack = scale_meal(snack, calorie_goal, snack_cals)
-        
-        # Calculate daily totals
-        daily_total = {
-            'calories': breakfast['calories'] + lunch['calories'] + dinner['calories'] + snack['calories'],
-            'protein': round(breakfast['protein'] + lunch['protein'] + dinner['protein'] + snack['protein'], 1),
-            'carbs': round(breakfast['carbs'] + lunch['carbs'] + dinner['carbs'] + snack['carbs'], 1),
-            'fats': round(breakfast['fats'] + lunch['fats'] + dinner['fats'] + snack['fats'], 1)
-        }
+        breakfast = scale_meal(breakfast, breakfast_cals)
+        lunch = scale_meal(lunch, lunch_cals)
+        dinner = scale_meal(dinner, dinner_cals)
+        snack = scale_meal(snack, snack_cals)
         
         day_plan = {
             'day': day,
             'breakfast': breakfast,
             'lunch': lunch,
             'dinner': dinner,
-            'snack': snack,
-            'daily_total': daily_total
+            'snack': snack
         }
+        day_plan['daily_total'] = calculate_daily_total(day_plan)
         
         meal_plan.append(day_plan)
     
     return meal_plan
 
+def calculate_daily_total(day_plan):
+    """Sum calories and macros over a day's meals in a single pass"""
+    calories = protein = carbs = fats = 0
+    
+    for slot in MEAL_SLOTS:
+        meal = day_plan[slot]
+        calories += meal['calories']
+        protein += meal['protein']
+        carbs += meal['carbs']
+        fats += meal['fats']
+    
+    return {
+        'calories': calories,
+        'protein': round(protein, 1),
+        'carbs': round(carbs, 1),
+        'fats': round(fats, 1)
+    }
+
+def replace_meal(day_plan, meal_type, new_meal):
+    """
+    Swap a meal into a day and adjust daily_total by the difference
+    The other meals are not re-summed; returns the updated daily_total
+    """
+    old_meal = day_plan[meal_type]
+    daily_total = day_plan['daily_total']
+    
+    daily_total['calories'] = daily_total['calories'] - old_meal['calories'] + new_meal['calories']
+    for key in ('protein', 'carbs', 'fats'):
+        daily_total[key] = round(daily_total[key] - old_meal[key] + new_meal[key], 1)
+    
+    day_plan[meal_type] = new_meal
+    return daily_total
+
 def generate_grocery_list(meal_plan):
     """Generate a grocery list from meal plan"""
     # This is a simplified version - in production, you'd have ingredient data
-    items = set()
-    
-    for day in meal_plan:
-        items.add(day['breakfast']['name'])
-        items.add(day['lunch']['name'])
-        items.add(day['dinner']['name'])
-        items.add(day['snack']['name'])
-    
-    return sorted(list(items))
\ No newline at end of file
+    return sorted({day[slot]['name'] for day in meal_plan for slot in MEAL_SLOTS})
\ No newline at end of file
@@ -3,10 +3,12 @@ Sentiment Analyzer Module
 Analyzes mood and sentiment from journal entries
 """
 
-from textblob import TextBlob
+from textblob.sentiments import PatternAnalyzer
 import re
-from collections import Counter
-from datetime import datetime
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from functools import lru_cache
+from operator import itemgetter
 
 # Emotion keywords for enhanced analysis
 EMOTION_KEYWORDS = {
@@ -27,27 +29,74 @@ EMOTION_KEYWORDS = {
     ]
 }
 
+# +1 for positive keywords, -1 for negative ones: one lookup classifies a word
+_POLARITY = {word: 1 for word in EMOTION_KEYWORDS['positive']}
+_POLARITY.update((word, -1) for word in EMOTION_KEYWORDS['negative'])
+
+# One shared analyzer (the same one TextBlob uses by default) so each call
+# skips building a TextBlob around the text
+_ANALYZER = PatternAnalyzer()
+
+_WORD_RE = re.compile(r'\b\w+\b')
+
+def _tokenize(text):
+    """Lowercased words of text, as both analyzers see them"""
+    return _WORD_RE.findall(text.lower())
+
+# Common stop words skipped by keyword extraction
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
+    'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these',
+    'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'my', 'your',
+    'his', 'her', 'its', 'our', 'their', 'me', 'him', 'them', 'what',
+    'which', 'who', 'when', 'where', 'why', 'how', 'just', 'so', 'today',
+    'felt', 'feel', 'feeling'
+})
+
 def analyze_sentiment(text):
     """
     Analyze sentiment using TextBlob and keyword matching
     Returns: sentiment score, polarity, subjectivity, and emotion
+    Results are cached per text; each call gets its own copy to mutate
     """
+    return dict(_cached_sentiment(text))
+
+@lru_cache(maxsize=4096)
+def _cached_sentiment(text):
+    """Analyze each distinct text once (never mutate the result)"""
+    # Nothing to score; this is what the full analysis yields for blank text
+    if not text or text.isspace():
+        return {
+            'sentiment': 'neutral',
+            'score': 0.0,
+            'polarity': 0.0,
+            'subjectivity': 0.0,
+            'positive_keywords': 0,
+            'negative_keywords': 0
+        }
+    
     # TextBlob analysis
-    blob = TextBlob(text)
-    polarity = blob.sentiment.polarity  # -1 to 1
-    subjectivity = blob.sentiment.subjectivity  # 0 to 1
+    polarity, subjectivity = _ANALYZER.analyze(text)  # -1 to 1, 0 to 1
     
     # Keyword-based emotion detection
-    text_lower = text.lower()
-    words = re.findall(r'\b\w+\b', text_lower)
+    words = _tokenize(text)
     
-    positive_count = sum(1 for word in words if word in EMOTION_KEYWORDS['positive'])
-    negative_count = sum(1 for word in words if word in EMOTION_KEYWORDS['negative'])
+    positive_count = negative_count = 0
+    for weight in map(_POLARITY.get, words):
+        if weight is None:
+            continue
+        if weight > 0:
+            positive_count += 1
+        else:
+            negative_count += 1
     
     # Combined sentiment score (-1 to 1)
     # Weight TextBlob polarity (70%) and keyword ratio (30%)
-    if len(words) > 0:
-        keyword_score = (positive_count - negative_count) / max(len(words), 1)
+    total = len(words)
+    if total > 0:
+        keyword_score = (positive_count - negative_count) / total
         combined_score = (0.7 * polarity) + (0.3 * keyword_score)
     else:
         combined_score = polarity
@@ -69,27 +118,22 @@ def analyze_sentiment(text):
         'negative_keywords': negative_count
     }
 
-def extract_keywords(text, top_n=10):
+def analyze_sentiment_batch(texts):
+    """
+    Analyze many texts with the shared analyzer, in order
+    Texts seen before (in this batch or earlier) come from the cache
+    """
+    return [dict(_cached_sentiment(text)) for text in texts]
+
+def extract_keywords(text, top_n=10, tokens=None):
     """
     Extract most common meaningful words from text
+    tokens: _tokenize(text) when the caller already has it
     """
-    # Remove common stop words
-    stop_words = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
-        'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-        'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these',
-        'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'my', 'your',
-        'his', 'her', 'its', 'our', 'their', 'me', 'him', 'them', 'what',
-        'which', 'who', 'when', 'where', 'why', 'how', 'just', 'so', 'today',
-        'felt', 'feel', 'feeling'
-    }
-    
-    text_lower = text.lower()
-    words = re.findall(r'\b\w+\b', text_lower)
-    meaningful_words = [w for w in words if w not in stop_words and len(w) > 3]
+    words = _tokenize(text) if tokens is None else tokens
     
-    word_freq = Counter(meaningful_words)
+    # most_common(n) selects with heapq.nlargest, no full sort
+    word_freq = Counter(w for w in words if len(w) > 3 and w not in _STOP_WORDS)
     return word_freq.most_common(top_n)
 
 def analyze_mood_trend(entries):
@@ -101,34 +145,41 @@ def analyze_mood_trend(entries):
     
     sentiments = []
     dates = []
-    daily_scores = {}
+    sentiment_counts = {}
+    score_sums = defaultdict(float)
+    score_counts = defaultdict(int)
+    
+    analyses = analyze_sentiment_batch([entry['content'] for entry in entries])
+    today = datetime.now().strftime('%Y-%m-%d')
     
-    for entry in entries:
-        analysis = analyze_sentiment(entry['content'])
-        entry_date = entry.get('date', datetime.now().strftime('%Y-%m-%d'))
+    for entry, analysis in zip(entries, analyses):
+        entry_date = entry.get('date', today)
         
-        sentiments.append(analysis['sentiment'])
+        sentiment = analysis['sentiment']
+        sentiments.append(sentiment)
         dates.append(entry_date)
         
-        # Store daily score
-        if entry_date not in daily_scores:
-            daily_scores[entry_date] = []
-        daily_scores[entry_date].append(analysis['score'])
+        # Count sentiment types
+        sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
+        
+        # Store daily score as a running sum and count
+        score_sums[entry_date] += analysis['score']
+        score_counts[entry_date] += 1
     
     # Calculate averages
-    avg_scores = {date: sum(scores)/len(scores) 
-                  for date, scores in daily_scores.items()}
-    
-    # Count sentiment types
-    sentiment_counts = Counter(sentiments)
+    avg_scores = {day: total / score_counts[day] for day, total in score_sums.items()}
     
-    # Find best and worst days
-    best_day = max(avg_scores.items(), key=lambda x: x[1]) if avg_scores else None
-    worst_day = min(avg_scores.items(), key=lambda x: x[1]) if avg_scores else None
+    # Find best and worst days in one pass (ties keep the first day, as max/min do)
+    best_day = worst_day = None
+    for day, score in avg_scores.items():
+        if best_day is None or score > best_day[1]:
+            best_day = (day, score)
+        if worst_day is None or score < worst_day[1]:
+            worst_day = (day, score)
     
     return {
         'total_entries': len(entries),
-        'sentiment_distribution': dict(sentiment_counts),
+        'sentiment_distribution': sentiment_counts,
         'daily_scores': avg_scores,
         'best_day': best_day,
         'worst_day': worst_day,
@@ -140,8 +191,7 @@ def calculate_overall_mood(sentiments):
     if not sentiments:
         return 'neutral'
     
-    counts = Counter(sentiments)
-    positive_ratio = counts.get('positive', 0) / len(sentiments)
+    positive_ratio = sentiments.count('positive') / len(sentiments)
     
     if positive_ratio >= 0.6:
         return 'mostly positive'
@@ -150,14 +200,21 @@ def calculate_overall_mood(sentiments):
     else:
         return 'needs attention'
 
-def generate_weekly_summary(entries):
+@lru_cache(maxsize=64)
+def _format_day(iso_date):
+    """'2024-01-15' -> 'Monday, January 15' (the same days recur across renders)"""
+    return date.fromisoformat(iso_date).strftime('%A, %B %d')
+
+def generate_weekly_summary(entries, trend=None):
     """
     Generate a natural language summary of the week
+    trend: analyze_mood_trend(entries) when the caller already has it
     """
     if not entries:
         return "No entries to analyze yet. Start journaling to see your mood trends!"
     
-    trend = analyze_mood_trend(entries)
+    if trend is None:
+        trend = analyze_mood_trend(entries)
     
     # Build summary
     summary_parts = []
@@ -176,11 +233,11 @@ def generate_weekly_summary(entries):
     
     # Best and worst days
     if trend['best_day']:
-        best_date = datetime.strptime(trend['best_day'][0], '%Y-%m-%d').strftime('%A, %B %d')
+        best_date = _format_day(trend['best_day'][0])
         summary_parts.append(f"Your most positive day was {best_date}.")
     
     if trend['worst_day'] and trend['worst_day'][1] < -0.1:
-        worst_date = datetime.strptime(trend['worst_day'][0], '%Y-%m-%d').strftime('%A, %B %d')
+        worst_date = _format_day(trend['worst_day'][0])
         summary_parts.append(f"You seemed to struggle most on {worst_date}.")
     
     # Overall mood
@@ -188,26 +245,28 @@ def generate_weekly_summary(entries):
     
     return " ".join(summary_parts)
 
+def _as_date(entry):
+    """An entry's date as a date; only entries without 'date_obj' are parsed"""
+    entry_date = entry.get('date_obj')
+    return entry_date if entry_date is not None else date.fromisoformat(entry['date'])
+
 def calculate_streak(entries):
     """Calculate consecutive days of journaling"""
     if not entries:
         return 0
     
-    dates = sorted([entry['date'] for entry in entries], reverse=True)
-    
-    if not dates:
-        return 0
+    # ISO dates sort as strings; convert them lazily, only until the streak breaks
+    ordered = iter(sorted(entries, key=itemgetter('date'), reverse=True))
     
     streak = 1
-    current_date = datetime.strptime(dates[0], '%Y-%m-%d')
+    current_date = _as_date(next(ordered))
     
-    for i in range(1, len(dates)):
-        date = datetime.strptime(dates[i], '%Y-%m-%d')
-        days_diff = (current_date - date).days
+    for entry_date in map(_as_date, ordered):
+        days_diff = (current_date - entry_date).days
         
         if days_diff == 1:
             streak += 1
-            current_date = date
+            current_date = entry_date
         elif days_diff > 1:
             break
     